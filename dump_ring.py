@@ -12,26 +12,64 @@ Usage:
   python dump_ring.py --gatt-dump gatt_tree.txt           # write GATT tree to file
   python dump_ring.py --report-layout --gatt-dump gatt.txt
   python dump_ring.py --verbose                          # log every notification (noisy)
+  python dump_ring.py --report-layout --batch-notifications 1  # print each report as it arrives
   python dump_ring.py --write-ae41 01 --write-fff2 01    # try enable commands (vendor path)
   python dump_ring.py AA:BB:CC:DD:EE:FF --report-layout  # by address
 """
 
 from __future__ import annotations
 
-import argparse
-import asyncio
+import re
 import sys
+import types
+from typing import TYPE_CHECKING
 
-import main as main_module
+if TYPE_CHECKING:
+    import argparse
 
+# A BLE MAC address (AA:BB:CC:DD:EE:FF, any case); same check as main._MAC_RE, which is not imported before parsing
+_MAC_RE = re.compile(r"^[0-9A-Fa-f]{2}(:[0-9A-Fa-f]{2}){5}$")
+
+
+def _device_arg(value: str) -> str:
+    """argparse type: canonicalize a BLE address (AA:BB:CC:DD:EE:FF, any case) to upper case; names pass through unchanged."""
+    return value.upper() if _MAC_RE.match(value) else value
+
+
+def _hex_bytes(value: str) -> bytes:
+    """argparse type: decode a hex string (e.g. "0201") to bytes, failing at parse time if invalid."""
+    try:
+        return bytes.fromhex(value)
+    except ValueError:
+        import argparse
+
+        raise argparse.ArgumentTypeError(f"invalid hex payload: {value!r}") from None
+
+
+# Option values used when no command-line arguments are given (also the parser defaults)
+_DEFAULT_OPTIONS = {
+    "device": None,
+    "report_layout": False,
+    "gatt_dump": None,
+    "verbose": False,
+    "write_ae41": None,
+    "write_fff2": None,
+    "batch_notifications": 64,
+    "batch_delay_ms": 100.0,
+}
+
+
+def _parse_args() -> argparse.Namespace:
+    """Build the CLI parser and parse sys.argv. argparse is only imported when there are arguments to parse."""
+    import argparse
 
-def main() -> None:
     parser = argparse.ArgumentParser(
         description="Ring BLE test/dump: single connect, optional GATT dump and report layout logging."
     )
     parser.add_argument(
         "device",
         nargs="?",
+        type=_device_arg,
         default=None,
         help="BLE address (AA:BB:CC:DD:EE:FF) or device name. Default: use default from main.py",
     )
@@ -54,48 +92,85 @@ def main() -> None:
     )
     parser.add_argument(
         "--write-ae41",
-        type=str,
+        type=_hex_bytes,
         default=None,
         metavar="HEX",
         help="On connect (vendor path), write HEX to char 0xAE41 (e.g. 01). No spaces.",
     )
     parser.add_argument(
         "--write-fff2",
-        type=str,
+        type=_hex_bytes,
         default=None,
         metavar="HEX",
         help="On connect (vendor path), write HEX to char 0xFFF2 (e.g. 01). No spaces.",
     )
-    args = parser.parse_args()
+    parser.add_argument(
+        "--batch-notifications",
+        type=int,
+        metavar="N",
+        help="Write --report-layout/--verbose output once N notifications are queued; 1 = no batching (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--batch-delay-ms",
+        type=float,
+        metavar="MS",
+        help="Max milliseconds a logged notification waits for its batch (default: %(default)s)",
+    )
+    parser.set_defaults(**_DEFAULT_OPTIONS)
+    return parser.parse_args()
+
+
+def main() -> None:
+    # Plain `python dump_ring.py` is the common case: skip building the argument parser
+    args = _parse_args() if len(sys.argv) > 1 else types.SimpleNamespace(**_DEFAULT_OPTIONS)
+
+    # Imported after parsing so --help and argument errors don't pay for loading bleak
+    import main as main_module
 
-    main_module.REPORT_LAYOUT_VERBOSE = args.report_layout
-    main_module.NOTIFY_VERBOSE = args.verbose
     gatt_dump_file = args.gatt_dump
-    write_ae41_hex = args.write_ae41
-    write_fff2_hex = args.write_fff2
+    write_ae41 = args.write_ae41
+    write_fff2 = args.write_fff2
 
+    banner = []
     if args.report_layout:
-        print("Report layout logging: ON (HID Report notifications will print len + hex)")
+        banner.append("Report layout logging: ON (HID Report notifications will print len + hex)")
     if args.verbose:
-        print("Verbose notifications: ON (all notifications will be printed)")
+        banner.append("Verbose notifications: ON (all notifications will be printed)")
     if gatt_dump_file:
-        print(f"GATT dump: will write tree to {gatt_dump_file}")
-    if write_ae41_hex:
-        print(f"Will write to 0xAE41: {write_ae41_hex}")
-    if write_fff2_hex:
-        print(f"Will write to 0xFFF2: {write_fff2_hex}")
-
-    print("Connecting once (no reconnect). Press Ctrl+C to disconnect and exit.")
-    asyncio.run(
-        main_module.run_hid_client(
-            args.device,
-            keepalive_interval=0,  # no keepalive for dump session
-            battery_poll_interval=0,
-            gatt_dump_file=gatt_dump_file,
-            write_ae41_hex=write_ae41_hex,
-            write_fff2_hex=write_fff2_hex,
-        )
+        banner.append(f"GATT dump: will write tree to {gatt_dump_file}")
+    if write_ae41:
+        banner.append(f"Will write to 0xAE41: {write_ae41.hex()}")
+    if write_fff2:
+        banner.append(f"Will write to 0xFFF2: {write_fff2.hex()}")
+
+    # Open the dump file up front: a bad path fails before connecting, and the tree is written through one large buffer
+    gatt_dump_fp = (
+        open(gatt_dump_file, "w", encoding="utf-8", buffering=main_module.GATT_DUMP_BUFFER_SIZE)
+        if gatt_dump_file
+        else None
     )
+
+    banner.append("Connecting once (no reconnect). Press Ctrl+C to disconnect and exit.")
+    sys.stdout.write("\n".join(banner) + "\n")
+    try:
+        main_module.run_async(
+            main_module.run_hid_client(
+                args.device,
+                keepalive_interval=0,  # no keepalive for dump session
+                battery_poll_interval=0,
+                gatt_cache_dir=None,  # always read and print everything for a dump
+                gatt_dump_file=gatt_dump_fp,
+                write_ae41=write_ae41,
+                write_fff2=write_fff2,
+                notify_verbose=args.verbose,
+                report_layout_verbose=args.report_layout,
+                notify_log_batch_size=args.batch_notifications,
+                notify_log_batch_delay=args.batch_delay_ms / 1000.0,
+            )
+        )
+    finally:
+        if gatt_dump_fp is not None:
+            gatt_dump_fp.close()
     print("Disconnected. Exiting.")
 
 
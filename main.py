@@ -7,7 +7,10 @@ Replicates the Android Bluetooth stack logic when connecting to a HID device
 write Exit Suspend to HID Control Point, and handle incoming reports.
 
 Supports battery level reading, optional periodic keepalives, and automatic
-reconnect on disconnect.
+reconnect on disconnect. The discovered GATT layout and static HID reads are
+cached per device (~/.cache/rayneo-ring, env RING_BLE_GATT_CACHE_DIR; empty
+disables) so reconnects skip them (and, on Windows, discover only the services
+in use) until the layout or Service Changed says otherwise.
 
 Usage:
   pip install bleak
@@ -15,27 +18,80 @@ Usage:
   python main.py AA:BB:CC:DD:EE:FF                 # connect by address
   python main.py "My Ring" --keepalive-interval 30  # enable keepalive every 30s
   python main.py --reconnect-delay 5                # reconnect after 5s (default 3)
+  RING_BLE_SCAN_FILTER=1 python main.py             # scan only for devices advertising HID/vendor services
+  RING_BLE_NOTIFY_VERBOSE=raw python main.py        # record notifications to ring_notify.bin (<dHH + payload)
 """
 
 from __future__ import annotations
 
 import argparse
 import asyncio
+import collections
+import functools
+import hashlib
+import heapq
+import inspect
+import json
 import os
+import re
+import struct
 import sys
-from typing import Callable, Optional
+import time
+from typing import Awaitable, Callable, List, Optional, TextIO, Tuple, Union
 
-# Set to True or RING_BLE_NOTIFY_VERBOSE=1 to print every notification (noisy)
+# Default for run_hid_client(notify_verbose=...); RING_BLE_NOTIFY_VERBOSE=1 prints every notification (noisy)
 NOTIFY_VERBOSE = os.environ.get("RING_BLE_NOTIFY_VERBOSE", "").lower() in ("1", "true", "yes")
-# Set RING_BLE_REPORT_LAYOUT=1 to log every HID Report notification as len + hex (for reverse-engineering IMU layout)
+# Default for run_hid_client(notify_raw_file=...); RING_BLE_NOTIFY_VERBOSE=raw appends every notification as a
+# binary record to RING_BLE_NOTIFY_RAW_FILE (default ring_notify.bin) instead of printing it
+NOTIFY_RAW_FILE = (
+    os.environ.get("RING_BLE_NOTIFY_RAW_FILE") or "ring_notify.bin"
+    if os.environ.get("RING_BLE_NOTIFY_VERBOSE", "").lower() == "raw"
+    else None
+)
+# Default for run_hid_client(report_layout_verbose=...); RING_BLE_REPORT_LAYOUT=1 logs every HID Report
+# notification as len + hex (for reverse-engineering IMU layout)
 REPORT_LAYOUT_VERBOSE = os.environ.get("RING_BLE_REPORT_LAYOUT", "").lower() in ("1", "true", "yes")
 
 from bleak import BleakClient, BleakScanner
 from bleak.backends.characteristic import BleakGATTCharacteristic
 from bleak.exc import BleakError
 
+# BleakClient(winrt={...}) backend options exist from bleak 0.20 on; older versions reject the keyword
+_BLEAK_CLIENT_WINRT_ARGS = "winrt" in inspect.signature(BleakClient.__init__).parameters
+# BleakClient(services=[...]) only saves GATT traffic on WinRT (the default backend on Windows); BlueZ resolves the
+# whole tree before bleak filters it, so elsewhere reconnects keep doing a full discovery
+_FILTERED_DISCOVERY = sys.platform == "win32"
+
+try:
+    import uvloop  # optional: faster event loop on Linux/macOS (pip install uvloop)
+except ImportError:  # not installed, or Windows
+    uvloop = None
+
 # Default HID device address (smart ring)
 DEFAULT_DEVICE_ADDRESS = "B0:B3:53:EB:40:8D"
+# A BLE MAC address (AA:BB:CC:DD:EE:FF, any case); anything else is treated as a device name
+_MAC_RE = re.compile(r"^[0-9A-Fa-f]{2}(:[0-9A-Fa-f]{2}){5}$")
+
+# Scan filter on advertised services (RING_BLE_SCAN_FILTER=1). Off by default: the ring's vendor-GATT
+# advertisement is not guaranteed to list any of these, and the filter would then hide it completely.
+SCAN_SERVICE_UUIDS = [
+    "00001812-0000-1000-8000-00805f9b34fb",  # HID
+    "0000ae40-0000-1000-8000-00805f9b34fb",  # vendor
+    "0000fff0-0000-1000-8000-00805f9b34fb",  # vendor
+]
+SCAN_FILTER = os.environ.get("RING_BLE_SCAN_FILTER", "").lower() in ("1", "true", "yes")
+
+# RING_BLE_LOW_LATENCY=1: after connect, ask for a short connection interval (lower notification latency, more radio
+# use on the ring). Off by default: only the WinRT and Android backends can make this request, via bleak internals.
+LOW_LATENCY_CONNECTION = os.environ.get("RING_BLE_LOW_LATENCY", "").lower() in ("1", "true", "yes")
+
+# Write buffer for --gatt-dump files (the tree is written in one go)
+GATT_DUMP_BUFFER_SIZE = 65536
+
+# Per-device GATT cache (structure + static HID reads), reused across reconnects; RING_BLE_GATT_CACHE_DIR="" disables
+GATT_CACHE_DIR = os.environ.get(
+    "RING_BLE_GATT_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "rayneo-ring")
+)
 
 # HID over GATT UUIDs (from Android GattService.java)
 HID_SERVICE_UUID = "00001812-0000-1000-8000-00805f9b34fb"
@@ -57,6 +113,13 @@ CCCD_NOTIFY_ENABLE = bytes([0x01, 0x00])
 BATTERY_SERVICE_UUID = "0000180f-0000-1000-8000-00805f9b34fb"
 BATTERY_LEVEL_CHAR_UUID = "00002a19-0000-1000-8000-00805f9b34fb"
 
+# Generic Access / Device Information: no subscriptions, but their readable chars are keepalive fallback candidates
+GENERIC_ACCESS_SERVICE_UUID = "00001800-0000-1000-8000-00805f9b34fb"
+DEVICE_INFORMATION_SERVICE_UUID = "0000180a-0000-1000-8000-00805f9b34fb"
+
+# Generic Attribute service: Service Changed (indicate) tells us the peer's GATT layout changed
+SERVICE_CHANGED_CHAR_UUID = "00002a05-0000-1000-8000-00805f9b34fb"
+
 # Environmental Sensing (0x181A) - optional sensor/IMU-related service to discover
 ENVIRONMENTAL_SENSING_SERVICE_UUID = "0000181a-0000-1000-8000-00805f9b34fb"
 
@@ -64,41 +127,259 @@ ENVIRONMENTAL_SENSING_SERVICE_UUID = "0000181a-0000-1000-8000-00805f9b34fb"
 VENDOR_CHAR_AE41_UUID = "0000ae41-0000-1000-8000-00805f9b34fb"  # write-no-response, service 0xAE40
 VENDOR_CHAR_FFF2_UUID = "0000fff2-0000-1000-8000-00805f9b34fb"  # write-no-response, service 0xFFF0
 
+# Normalized (lowercase, no dashes) forms of the UUIDs above, computed once; compare against _uuid_norm(...).
+# The UUID constants are written in lowercase (as bleak reports UUIDs), so only the dashes need stripping.
+_HID_SERVICE_UUID_NORM = HID_SERVICE_UUID.replace("-", "")
+_HID_CHAR_UUID_NORMS = {name: uuid.replace("-", "") for name, uuid in HID_CHAR_UUIDS.items()}
+_BATTERY_SERVICE_UUID_NORM = BATTERY_SERVICE_UUID.replace("-", "")
+_BATTERY_LEVEL_CHAR_UUID_NORM = BATTERY_LEVEL_CHAR_UUID.replace("-", "")
+_ENV_SENSING_SERVICE_UUID_NORM = ENVIRONMENTAL_SENSING_SERVICE_UUID.replace("-", "")
+_GENERIC_ACCESS_SERVICE_UUID_NORM = GENERIC_ACCESS_SERVICE_UUID.replace("-", "")
+_DEVICE_INFORMATION_SERVICE_UUID_NORM = DEVICE_INFORMATION_SERVICE_UUID.replace("-", "")
+_VENDOR_CHAR_AE41_UUID_NORM = VENDOR_CHAR_AE41_UUID.replace("-", "")
+_VENDOR_CHAR_FFF2_UUID_NORM = VENDOR_CHAR_FFF2_UUID.replace("-", "")
+_SERVICE_CHANGED_CHAR_UUID_NORM = SERVICE_CHANGED_CHAR_UUID.replace("-", "")
+# Normalized UUID prefixes of the vendor services (0xAE40, 0xAE00, 0xFFF0), whose notifications carry ring reports
+_VENDOR_REPORT_SERVICE_UUID_PREFIXES = ("0000ae40", "0000ae00", "0000fff0")
+# ... and of all vendor / sensor services whose readable characteristics are probed (plus Environmental Sensing)
+_VENDOR_SERVICE_UUID_PREFIXES = _VENDOR_REPORT_SERVICE_UUID_PREFIXES + ("0000181a",)
 
-def notification_handler(characteristic: BleakGATTCharacteristic, data: bytearray) -> None:
-    """Handle incoming notifications from the device."""
-    report_uuid_lower = (characteristic.uuid or "").lower().replace("-", "")
-    if REPORT_LAYOUT_VERBOSE and report_uuid_lower == HID_CHAR_UUIDS["report"].replace("-", ""):
-        print(f"[Report layout] len={len(data)} hex={data.hex()}")
-    if NOTIFY_VERBOSE:
-        print(f"[Notify] len={len(data)} {characteristic.uuid} (handle={characteristic.handle}) data={data.hex()} ({list(data)})")
 
+def _uuid_norm(attr) -> str:
+    """Normalized UUID of a service/characteristic (lowercase, no dashes), computed once and cached on the object."""
+    try:
+        return attr._uuid_norm
+    except AttributeError:
+        norm = attr._uuid_norm = (attr.uuid or "").lower().replace("-", "")
+        return norm
 
-def _find_battery_char(client: BleakClient) -> Optional[BleakGATTCharacteristic]:
-    """Find standard Battery Level characteristic from client.services. Returns None if not found."""
-    for service in client.services:
-        if not service.uuid or service.uuid.lower().replace("-", "") != BATTERY_SERVICE_UUID.replace("-", ""):
-            continue
-        for char in service.characteristics:
-            if char.uuid and char.uuid.lower().replace("-", "") == BATTERY_LEVEL_CHAR_UUID.replace("-", ""):
-                if "read" in (char.properties or []):
-                    return char
+
+NotificationCallback = Callable[[BleakGATTCharacteristic, bytearray], None]
+
+# Verbose notification logging is written in batches: once this many notifications are queued, or this many
+# seconds after the first; at most NOTIFY_LOG_QUEUE_SIZE are held (oldest dropped) if the writer falls behind
+NOTIFY_LOG_BATCH_SIZE = 64
+NOTIFY_LOG_BATCH_DELAY = 0.1
+NOTIFY_LOG_QUEUE_SIZE = 4096
+# Raw notification record: time.time() (float64), characteristic handle (uint16), payload length (uint16),
+# little-endian, followed by the payload bytes
+NOTIFY_RAW_RECORD = struct.Struct("<dHH")
+
+
+class _NotificationLogger:
+    """
+    Verbose / report-layout notification logging kept off the notification path: the handler only queues
+    (characteristic, payload); formatting and the stdout write happen in a loop callback, one write per batch.
+    With raw_path set, every notification is also appended to that file as a NOTIFY_RAW_RECORD + payload.
+    """
+
+    def __init__(
+        self,
+        report_layout_verbose: bool,
+        notify_verbose: bool,
+        max_batch_size: int = NOTIFY_LOG_BATCH_SIZE,
+        max_batch_delay: float = NOTIFY_LOG_BATCH_DELAY,
+        max_queued: int = NOTIFY_LOG_QUEUE_SIZE,
+        raw_path: Optional[str] = None,
+    ) -> None:
+        self.report_layout_verbose = report_layout_verbose
+        self.notify_verbose = notify_verbose
+        self.raw_path = raw_path
+        self._raw_file = None
+        self._closed = False
+        self._queue: collections.deque = collections.deque(maxlen=max(1, max_queued))
+        self._max_batch_size = max(1, max_batch_size)
+        self._max_batch_delay = max_batch_delay
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._flush_scheduled = False
+        self._dropped = 0
+
+    def put(self, characteristic: BleakGATTCharacteristic, data: bytearray) -> None:
+        """Queue a notification for logging and schedule a flush; never writes from the caller."""
+        if self._closed:
+            return  # late notification after close(): don't reopen the raw file
+        queue = self._queue
+        if len(queue) == queue.maxlen:
+            self._dropped += 1  # deque drops the oldest entry
+        queue.append((characteristic, bytes(data), time.time()))
+        if len(queue) >= self._max_batch_size:
+            if not self._flush_scheduled:
+                self._flush_scheduled = True
+                asyncio.get_running_loop().call_soon(self.flush)
+        elif self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(self._max_batch_delay, self.flush)
+
+    def flush(self) -> None:
+        """Format all queued notifications and write them with a single stdout write (and one raw file write)."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        self._flush_scheduled = False
+        queue = self._queue
+        if not queue or self._closed:
+            return
+        report_layout = self.report_layout_verbose
+        verbose = self.notify_verbose
+        raw = self.raw_path is not None
+        report_uuid = _HID_CHAR_UUID_NORMS["report"]
+        pack_record = NOTIFY_RAW_RECORD.pack
+        lines = []
+        records = []
+        while queue:
+            characteristic, data, timestamp = queue.popleft()
+            if raw:
+                records.append(pack_record(timestamp, characteristic.handle, len(data)))
+                records.append(data)
+            if not (verbose or report_layout):
+                continue
+            hex_data = data.hex().encode()  # encode once; shared by both log lines
+            if report_layout and _uuid_norm(characteristic) == report_uuid:
+                lines.append(b"[Report layout] len=%d hex=%s" % (len(data), hex_data))
+            if verbose:
+                lines.append(
+                    b"[Notify] len=%d %s (handle=%d) data=%s"
+                    % (len(data), characteristic.uuid.encode("ascii"), characteristic.handle, hex_data)
+                )
+        if self._dropped:
+            lines.append(b"[Notify] log queue full: dropped %d notification(s)" % self._dropped)
+            self._dropped = 0
+        if records:
+            if self._raw_file is None:
+                self._raw_file = open(self.raw_path, "ab")
+            self._raw_file.write(b"".join(records))
+        if lines:
+            _write_stdout_bytes(b"\n".join(lines) + b"\n")
+
+    def close(self) -> None:
+        """Flush what is queued and close the raw record file, if one was opened."""
+        self.flush()
+        self._closed = True
+        if self._raw_file is not None:
+            self._raw_file.close()
+            self._raw_file = None
+
+
+def _write_stdout_bytes(data: bytes) -> None:
+    """Write ASCII bytes to stdout's binary buffer, after flushing pending text so output stays in order."""
+    stdout = sys.stdout
+    buffer = getattr(stdout, "buffer", None)
+    if buffer is None:  # stdout replaced by a text-only stream
+        stdout.write(data.decode("ascii", "replace"))
+        return
+    stdout.flush()
+    buffer.write(data)
+    buffer.flush()
+
+
+def _ignore_notification(characteristic: BleakGATTCharacteristic, data: bytearray) -> None:
+    """Notification handler used when nothing is logged and no on_notification callback is registered."""
+
+
+def _make_notification_handler(
+    on_notification: Optional[NotificationCallback] = None,
+    notification_logger: Optional[_NotificationLogger] = None,
+) -> NotificationCallback:
+    """
+    Pick the notification handler for a connection. The logging flags are resolved here, once, so the function
+    bleak calls per notification has no flag checks; with logging off it is on_notification itself (or a no-op).
+    """
+    if notification_logger is None:
+        return on_notification if on_notification is not None else _ignore_notification
+
+    if not (notification_logger.notify_verbose or notification_logger.raw_path is not None):
+
+        def report_layout_handler(
+            characteristic: BleakGATTCharacteristic,
+            data: bytearray,
+            _put: NotificationCallback = notification_logger.put,
+            _report_uuid: str = _HID_CHAR_UUID_NORMS["report"],
+            _callback: Optional[NotificationCallback] = on_notification,
+        ) -> None:
+            """Queue HID Report notifications for report-layout logging."""
+            if _uuid_norm(characteristic) == _report_uuid:
+                _put(characteristic, data)
+            if _callback is not None:
+                _callback(characteristic, data)
+
+        return report_layout_handler
+
+    def verbose_handler(
+        characteristic: BleakGATTCharacteristic,
+        data: bytearray,
+        _put: NotificationCallback = notification_logger.put,
+        _callback: Optional[NotificationCallback] = on_notification,
+    ) -> None:
+        """Queue every notification for logging."""
+        _put(characteristic, data)
+        if _callback is not None:
+            _callback(characteristic, data)
+
+    return verbose_handler
+
+
+class _GattIndex:
+    """
+    Lookup tables over a connected client's GATT tree, built in one pass right after connect so later lookups
+    are dict hits instead of walks over client.services. Keys are normalized UUIDs; the first occurrence wins.
+    Each characteristic also gets _props_set, a frozenset of its properties for O(1) membership tests.
+    Services are classified in the same pass: hid / env_sensing (first match or None) and vendor (all services
+    matching _VENDOR_SERVICE_UUID_PREFIXES, Environmental Sensing included). writable_chars_by_uuid lists, per
+    normalized UUID, the first writable characteristic with that UUID in each service.
+    """
+
+    def __init__(self, services) -> None:
+        self.services: list = []
+        self.chars: list = []
+        self.services_by_uuid: dict = {}
+        self.chars_by_uuid: dict = {}
+        self.writable_chars_by_uuid: dict = {}
+        self.vendor: list = []
+        for service in services:
+            uuid_norm = _uuid_norm(service)
+            self.services.append(service)
+            self.services_by_uuid.setdefault(uuid_norm, service)
+            if uuid_norm.startswith(_VENDOR_SERVICE_UUID_PREFIXES):
+                self.vendor.append(service)
+            writable = {}  # first writable char per UUID in this service
+            for char in service.characteristics:
+                char._props_set = props = frozenset(char.properties or ())
+                char_uuid_norm = _uuid_norm(char)
+                self.chars.append(char)
+                self.chars_by_uuid.setdefault(char_uuid_norm, char)
+                if "write" in props or "write-without-response" in props:
+                    writable.setdefault(char_uuid_norm, char)
+            for char_uuid_norm, char in writable.items():
+                self.writable_chars_by_uuid.setdefault(char_uuid_norm, []).append(char)
+        self.hid = self.services_by_uuid.get(_HID_SERVICE_UUID_NORM)
+        self.env_sensing = self.services_by_uuid.get(_ENV_SENSING_SERVICE_UUID_NORM)
+
+
+def _find_battery_char(gatt: _GattIndex) -> Optional[BleakGATTCharacteristic]:
+    """Find standard Battery Level characteristic in the Battery service. Returns None if not found."""
+    service = gatt.services_by_uuid.get(_BATTERY_SERVICE_UUID_NORM)
+    if service is None:
+        return None
+    for char in service.characteristics:
+        if _uuid_norm(char) == _BATTERY_LEVEL_CHAR_UUID_NORM:
+            if "read" in char._props_set:
+                return char
     return None
 
 
 async def _read_battery_level(client: BleakClient, char: BleakGATTCharacteristic) -> Optional[int]:
     """Read battery level characteristic; return 0-100 or None on failure."""
     try:
-        value = await client.read_gatt_char(char.uuid)
-        if value is not None and len(value) >= 1:
-            return min(100, max(0, int(value[0])))
+        value = await client.read_gatt_char(char)
+        if value:
+            level = value[0]  # already an int 0-255; only the upper bound needs clamping
+            return 100 if level > 100 else level
     except Exception:
         pass
     return None
 
 
 def _pick_keepalive_char(
-    client: BleakClient,
+    gatt: _GattIndex,
     battery_char: Optional[BleakGATTCharacteristic],
     keepalive_mode: str,
 ) -> Optional[BleakGATTCharacteristic]:
@@ -106,101 +387,326 @@ def _pick_keepalive_char(
     if keepalive_mode == "battery" and battery_char is not None:
         return battery_char
     # Fallback: first readable characteristic that is not HID Control Point
-    for service in client.services:
-        for char in service.characteristics:
-            if "read" not in (char.properties or []):
-                continue
-            uuid_lower = (char.uuid or "").lower()
-            if uuid_lower == HID_CHAR_UUIDS["control_point"]:
-                continue
-            return char
+    for char in gatt.chars:
+        if "read" not in char._props_set:
+            continue
+        if _uuid_norm(char) == _HID_CHAR_UUID_NORMS["control_point"]:
+            continue
+        return char
     return battery_char
 
 
-async def _keepalive_loop(
+class _BatteryState:
+    """Last reported battery level (None until the first read), shared by reads, polls and notifications."""
+
+    __slots__ = ("last",)
+
+    def __init__(self) -> None:
+        self.last: Optional[int] = None
+
+
+async def _keepalive_read(
     client: BleakClient,
-    interval_sec: float,
     char: BleakGATTCharacteristic,
     is_connected: Callable[[], bool],
     log_battery: bool = False,
-    battery_state: Optional[dict] = None,
+    battery_state: Optional[_BatteryState] = None,
     on_battery_updated: Optional[Callable[[int], None]] = None,
 ) -> None:
-    """Background task: periodically read the given characteristic while connected. Exits when disconnected."""
-    while is_connected() and interval_sec > 0:
-        try:
-            await asyncio.sleep(interval_sec)
-            if not is_connected():
-                break
-            print("[Keepalive] sending read")
-            data = await client.read_gatt_char(char.uuid)
-            if data is not None and len(data) >= 1:
-                level = min(100, max(0, int(data[0])))
-                if battery_state is not None:
-                    if level != battery_state.get("last"):
-                        print(f"Battery: {level}%")
-                        battery_state["last"] = level
-                    if on_battery_updated is not None:
-                        on_battery_updated(level)
-                elif log_battery:
+    """One keepalive: read the given characteristic (reporting battery level when it is the battery char)."""
+    try:
+        print("[Keepalive] sending read")
+        data = await client.read_gatt_char(char)
+        if data:
+            level = data[0]
+            if level > 100:
+                level = 100
+            if battery_state is not None:
+                if level != battery_state.last:
                     print(f"Battery: {level}%")
-        except asyncio.CancelledError:
-            break
-        except Exception as e:
-            if is_connected():
-                print(f"Keepalive read failed: {e}")
+                    battery_state.last = level
+                if on_battery_updated is not None:
+                    on_battery_updated(level)
+            elif log_battery:
+                print(f"Battery: {level}%")
+    except Exception as e:
+        if is_connected():
+            print(f"Keepalive read failed: {e}")
 
 
-async def _battery_poll_loop(
+async def _battery_poll(
     client: BleakClient,
     battery_char: BleakGATTCharacteristic,
-    interval_sec: float,
     is_connected: Callable[[], bool],
-    battery_state: dict,
+    battery_state: _BatteryState,
     on_battery_updated: Optional[Callable[[int], None]] = None,
 ) -> None:
-    """Dedicated task: periodically read battery characteristic. Exits when disconnected."""
-    while is_connected() and interval_sec > 0:
-        try:
-            await asyncio.sleep(interval_sec)
-            if not is_connected():
-                break
-            level = await _read_battery_level(client, battery_char)
-            if level is not None:
-                if level != battery_state.get("last"):
-                    print(f"Battery: {level}%")
-                    battery_state["last"] = level
-                if on_battery_updated is not None:
-                    on_battery_updated(level)
-        except asyncio.CancelledError:
+    """One battery poll: read the battery characteristic and report changes."""
+    try:
+        level = await _read_battery_level(client, battery_char)
+        if level is not None:
+            if level != battery_state.last:
+                print(f"Battery: {level}%")
+                battery_state.last = level
+            if on_battery_updated is not None:
+                on_battery_updated(level)
+    except Exception as e:
+        if is_connected():
+            print(f"Battery poll failed: {e}")
+
+
+async def _periodic_loop(
+    jobs: List[Tuple[float, Callable[[], Awaitable[None]]]],
+    disconnected: asyncio.Event,
+) -> None:
+    """
+    Background task running every (interval_sec, job) until disconnected is set: a min-heap of next deadlines and
+    a single wait until the earliest, instead of one sleeping task per job. Jobs with interval <= 0 are skipped.
+    """
+    loop = asyncio.get_running_loop()
+    now = loop.time()
+    heap = [(now + interval, i) for i, (interval, _) in enumerate(jobs) if interval > 0]
+    heapq.heapify(heap)
+    while heap and not disconnected.is_set():
+        deadline, i = heap[0]
+        delay = deadline - loop.time()
+        if delay > 0:
+            try:
+                await asyncio.wait_for(disconnected.wait(), delay)
+            except asyncio.TimeoutError:
+                continue
             break
-        except Exception as e:
-            if is_connected():
-                print(f"Battery poll failed: {e}")
+        interval, job = jobs[i]
+        # Next run is one interval after this one, or after now if a slow job made us miss a slot
+        heapq.heapreplace(heap, (max(deadline + interval, loop.time()), i))
+        await job()
 
 
-def _gatt_tree_string(client: BleakClient) -> str:
-    """Build a full GATT tree string (services, characteristics, descriptors) from client.services."""
-    lines = []
-    for service in client.services:
-        lines.append(f"Service {service.uuid} (handle {service.handle})")
+def _request_low_latency_connection(client: BleakClient):
+    """
+    Best-effort request for a short connection interval on the backend's native API. Returns an object that must
+    stay referenced while connected (WinRT drops the request when it is released), or None.
+
+    Uses private bleak attributes (BleakClientWinRT._requester, BleakClientP4Android.__gatt), checked against
+    bleak 3.0.2; a bleak that renames them makes this log "request failed" and keep the OS default.
+    """
+    backend = getattr(client, "_backend", None)
+    backend_name = type(backend).__name__
+    try:
+        if backend_name == "BleakClientWinRT":
+            from winrt.windows.devices.bluetooth import BluetoothLEPreferredConnectionParameters
+
+            request = backend._requester.request_preferred_connection_parameters(
+                BluetoothLEPreferredConnectionParameters.throughput_optimized
+            )
+            print(f"Connection parameters: requested throughput-optimized ({request.status})")
+            return request
+        if backend_name == "BleakClientP4Android":
+            backend._BleakClientP4Android__gatt.requestConnectionPriority(1)  # CONNECTION_PRIORITY_HIGH
+            print("Connection parameters: requested high connection priority")
+            return None
+    except Exception as e:
+        print(f"Connection parameters: request failed ({e})")
+        return None
+    # BlueZ and CoreBluetooth expose no client-side connection interval request
+    print(f"Connection parameters: OS default (no request API on {backend_name})")
+    return None
+
+
+async def _start_notifications(
+    client: BleakClient,
+    subscriptions: List[Tuple[BleakGATTCharacteristic, NotificationCallback]],
+) -> dict:
+    """
+    Enable notifications for (characteristic, handler) pairs concurrently, so the CCCD writes are in flight together
+    instead of one round trip each. Returns {characteristic handle: exception, or None on success}.
+    """
+    results = await asyncio.gather(
+        *(client.start_notify(char, handler) for char, handler in subscriptions),
+        return_exceptions=True,
+    )
+    errors = {}
+    for (char, _), result in zip(subscriptions, results):
+        if isinstance(result, asyncio.CancelledError):
+            raise result
+        errors[char.handle] = result if isinstance(result, BaseException) else None
+    return errors
+
+
+async def _read_chars(client: BleakClient, chars: List[BleakGATTCharacteristic]) -> list:
+    """
+    Read characteristics concurrently (queued back to back instead of one round trip at a time). Returns one result
+    per characteristic, in order: the value, or the exception the read raised.
+    """
+    results = await asyncio.gather(*(client.read_gatt_char(char) for char in chars), return_exceptions=True)
+    for result in results:
+        if isinstance(result, asyncio.CancelledError):
+            raise result
+    return results
+
+
+def _gatt_tree_lines(services, indent: str = ""):
+    """Yield the GATT tree (services, characteristics, descriptors) line by line, each prefixed with indent."""
+    for service in services:
+        yield f"{indent}Service {service.uuid} (handle {service.handle})"
         for char in service.characteristics:
-            props = ",".join(char.properties) if char.properties else ""
-            lines.append(f"  Char {char.uuid} handle={char.handle} [{props}]")
+            props = ",".join(char.properties or ())
+            yield f"{indent}  Char {char.uuid} handle={char.handle} [{props}]"
             for desc in char.descriptors:
-                lines.append(f"    Descriptor {desc.uuid} handle={desc.handle}")
-    return "\n".join(lines)
+                yield f"{indent}    Descriptor {desc.uuid} handle={desc.handle}"
 
 
-async def find_hid_device(name_or_address: Optional[str] = None, timeout: float = 10.0):
-    """Scan for a BLE device by name or address."""
-    print("Scanning for BLE devices...")
-    if name_or_address and len(name_or_address) == 17 and ":" in name_or_address:
-        # Assume it's an address
-        device = await BleakScanner.find_device_by_address(name_or_address, timeout=timeout)
+def _gatt_tree_string(client: BleakClient) -> str:
+    """Build a full GATT tree string (services, characteristics, descriptors) from client.services."""
+    return "\n".join(_gatt_tree_lines(client.services))
+
+
+def _gatt_cache_path(cache_dir: str, address: str) -> str:
+    """Cache file for a device address (or CoreBluetooth UUID)."""
+    name = "".join(c if c.isalnum() else "_" for c in address.replace(":", "").upper())
+    return os.path.join(cache_dir, f"{name}.json")
+
+
+def _used_services(gatt: _GattIndex) -> list:
+    """
+    Services this client touches: HID, Battery, vendor/sensor services, every service with a notify/indicate
+    characteristic (the vendor path subscribes to all of them, Service Changed included), and Generic Access /
+    Device Information, so the keepalive fallback (first readable char) is the same on cached and full discovery.
+    On reconnect (WinRT) only these are discovered.
+    """
+    always = (_BATTERY_SERVICE_UUID_NORM, _GENERIC_ACCESS_SERVICE_UUID_NORM, _DEVICE_INFORMATION_SERVICE_UUID_NORM)
+    return [
+        service
+        for service in gatt.services
+        if service is gatt.hid
+        or service in gatt.vendor
+        or _uuid_norm(service) in always
+        or any("notify" in char._props_set or "indicate" in char._props_set for char in service.characteristics)
+    ]
+
+
+def _gatt_signature(services) -> str:
+    """Hash of the discovered structure (service/char UUIDs, properties, handles) used to validate a cache entry."""
+    chars = [
+        [service.uuid, char.uuid, sorted(char.properties or []), char.handle]
+        for service in services
+        for char in service.characteristics
+    ]
+    return hashlib.sha256(json.dumps(chars).encode("utf-8")).hexdigest()
+
+
+def _load_gatt_cache(path: str) -> Optional[dict]:
+    """Return the cache entry at path, or None if there is none (or it is unreadable)."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return entry if isinstance(entry, dict) else None
+
+
+def _save_gatt_cache(path: str, entry: dict) -> None:
+    """Write a cache entry; failures are logged, never raised."""
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(entry, f, indent=1)
+    except OSError as e:
+        print(f"GATT cache not saved: {e}")
+
+
+def _invalidate_gatt_cache(path: str) -> None:
+    """Drop the cache entry (e.g. on Service Changed) so the next connect rediscovers and re-reads everything."""
+    try:
+        os.remove(path)
+        print(f"GATT cache invalidated: {path}")
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        print(f"GATT cache invalidation failed: {e}")
+
+
+def _write_gatt_dump(client: BleakClient, dest: Union[str, TextIO]) -> None:
+    """Write the GATT tree to dest: a file path (overwritten) or an open text stream (written and flushed once)."""
+    tree = _gatt_tree_string(client)
+    if isinstance(dest, str):
+        with open(dest, "w", encoding="utf-8", buffering=GATT_DUMP_BUFFER_SIZE) as f:
+            f.write(tree)
+        name = dest
     else:
-        device = await BleakScanner.find_device_by_name(name_or_address, timeout=timeout)
-    return device
+        dest.write(tree + "\n")
+        dest.flush()
+        name = getattr(dest, "name", "stream")
+    print(f"GATT tree written to {name}")
+
+
+class _DeviceScanner:
+    """
+    One BleakScanner reused for every (re)connect. Devices seen in advertisements are remembered by address and
+    name, so reconnecting to a device that was already found returns at once instead of starting a new scan.
+    Scanning stops as soon as the target is seen (scanning while connecting is unreliable on many adapters).
+    """
+
+    def __init__(self, service_uuids: Optional[List[str]] = None) -> None:
+        self._service_uuids = service_uuids
+        self._scanner: Optional[BleakScanner] = None
+        # Addresses (MACs, or CoreBluetooth UUIDs on macOS) compare case-insensitively, names exactly
+        self._by_address: dict = {}
+        self._by_name: dict = {}
+        self._target: Optional[Tuple[str, str]] = None  # (name, upper-cased address) being scanned for
+        self._found: Optional[asyncio.Event] = None
+
+    def _lookup(self, name_or_address: str):
+        device = self._by_address.get(name_or_address.upper())
+        return device if device is not None else self._by_name.get(name_or_address)
+
+    def _on_detection(self, device, advertisement_data) -> None:
+        address = device.address.upper()
+        name = advertisement_data.local_name or device.name
+        self._by_address[address] = device
+        if name:
+            self._by_name[name] = device
+        target = self._target
+        if target is not None and (name == target[0] or address == target[1]):
+            self._found.set()
+
+    async def find(self, name_or_address: str, timeout: float):
+        """Return the BLEDevice for name_or_address (cached or newly scanned), or None after timeout."""
+        device = self._lookup(name_or_address)
+        if device is not None:
+            return device
+        print("Scanning for BLE devices...")
+        if self._scanner is None:
+            # Active scanning: scan responses carry the local name (needed to match by name), and on Android
+            # bleak maps it to SCAN_MODE_LOW_LATENCY
+            self._scanner = BleakScanner(self._on_detection, service_uuids=self._service_uuids, scanning_mode="active")
+        self._found = asyncio.Event()
+        self._target = (name_or_address, name_or_address.upper())
+        await self._scanner.start()
+        try:
+            await asyncio.wait_for(self._found.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            self._target = None
+            self._found = None
+            await self._scanner.stop()
+        return self._lookup(name_or_address)
+
+    def forget(self, name_or_address: str) -> None:
+        """Drop a cached device (e.g. after a failed connect) so the next find() scans again."""
+        self._by_address.pop(name_or_address.upper(), None)
+        self._by_name.pop(name_or_address, None)
+
+
+_device_scanner = _DeviceScanner(SCAN_SERVICE_UUIDS if SCAN_FILTER else None)
+
+
+async def find_hid_device(name_or_address: Optional[str] = None, timeout: float = 10.0):
+    """Find a BLE device by name or address, reusing devices already seen by the shared scanner."""
+    if not name_or_address:
+        return None
+    return await _device_scanner.find(name_or_address, timeout)
 
 
 async def run_hid_client(
@@ -210,9 +716,16 @@ async def run_hid_client(
     keepalive_mode: str = "battery",
     battery_poll_interval: float = 60.0,
     on_battery_updated: Optional[Callable[[int], None]] = None,
-    gatt_dump_file: Optional[str] = None,
-    write_ae41_hex: Optional[str] = None,
-    write_fff2_hex: Optional[str] = None,
+    gatt_dump_file: Union[str, TextIO, None] = None,
+    write_ae41: Optional[bytes] = None,
+    write_fff2: Optional[bytes] = None,
+    notify_verbose: bool = NOTIFY_VERBOSE,
+    report_layout_verbose: bool = REPORT_LAYOUT_VERBOSE,
+    on_notification: Optional[NotificationCallback] = None,
+    notify_log_batch_size: int = NOTIFY_LOG_BATCH_SIZE,
+    notify_log_batch_delay: float = NOTIFY_LOG_BATCH_DELAY,
+    gatt_cache_dir: Optional[str] = GATT_CACHE_DIR,
+    notify_raw_file: Optional[str] = NOTIFY_RAW_FILE,
 ) -> None:
     """
     Connect to a HID device, enable Report notifications, and send Exit Suspend.
@@ -224,10 +737,33 @@ async def run_hid_client(
     keepalive_mode: which characteristic to use for keepalive (battery, read-report, vendor).
     battery_poll_interval: seconds between battery reads when battery char exists (0 = disabled, default 60).
     on_battery_updated: optional callback(level: int) when battery level is read or changes.
-    gatt_dump_file: if set, write full GATT tree (services/characteristics/descriptors) to this file path.
-    write_ae41_hex: if set (e.g. "01"), write this hex payload to vendor char 0xAE41 (write-no-response).
-    write_fff2_hex: if set (e.g. "01"), write this hex payload to vendor char 0xFFF2 (write-no-response).
+    gatt_dump_file: if set, write full GATT tree (services/characteristics/descriptors) to this file path
+        or open text stream.
+    write_ae41: if set (e.g. bytes([0x01])), write this payload to vendor char 0xAE41 (write-no-response).
+    write_fff2: if set (e.g. bytes([0x01])), write this payload to vendor char 0xFFF2 (write-no-response).
+    notify_verbose: print every notification (noisy; default from RING_BLE_NOTIFY_VERBOSE).
+    report_layout_verbose: print every HID Report notification as len + hex (default from RING_BLE_REPORT_LAYOUT).
+    on_notification: optional callback(characteristic, data) called for every notification.
+    notify_log_batch_size: queued verbose/report-layout notifications that trigger a write (1 = write each one).
+    notify_log_batch_delay: max seconds a verbose/report-layout notification waits for its batch (default 0.1).
+    gatt_cache_dir: directory for the per-device GATT cache; when the discovered structure matches the cache,
+        HID Information / Report Map reads and the vendor tree printout are skipped, and on Windows reconnects
+        discover only the services this client uses (all services when gatt_dump_file is set). None or "" = no cache.
+    notify_raw_file: if set, append every notification to this file as a NOTIFY_RAW_RECORD header
+        (time, handle, length) + payload (default from RING_BLE_NOTIFY_VERBOSE=raw / RING_BLE_NOTIFY_RAW_FILE).
     """
+    notification_logger = (
+        _NotificationLogger(
+            report_layout_verbose,
+            notify_verbose,
+            notify_log_batch_size,
+            notify_log_batch_delay,
+            raw_path=notify_raw_file,
+        )
+        if (report_layout_verbose or notify_verbose or notify_raw_file)
+        else None
+    )
+    notification_handler = _make_notification_handler(on_notification, notification_logger)
     target = address_or_name if address_or_name else DEFAULT_DEVICE_ADDRESS
     device = await find_hid_device(target)
     if device is None and not address_or_name:
@@ -239,177 +775,253 @@ async def run_hid_client(
         print(f"Device not found: {target}")
         return
 
+    # GATT cache: with an entry for this device, WinRT discovers only the services used last time (a full
+    # --gatt-dump still discovers everything) and may reuse the OS's own cached services
+    gatt_cache_path = _gatt_cache_path(gatt_cache_dir, device.address) if gatt_cache_dir else None
+    gatt_cache = _load_gatt_cache(gatt_cache_path) if gatt_cache_path else None
+    cached_services = (
+        gatt_cache.get("services") if gatt_cache and _FILTERED_DISCOVERY and not gatt_dump_file else None
+    )
+    client_kwargs: dict = {}
+    if cached_services:
+        client_kwargs["services"] = cached_services
+        if _BLEAK_CLIENT_WINRT_ARGS:
+            client_kwargs["winrt"] = {"use_cached_services": True}
+
     print(f"Connecting to {device.address}...")
-    async with BleakClient(device, timeout=20.0) as client:
+    disconnected = asyncio.Event()
+    async with BleakClient(
+        device, disconnected_callback=lambda _client: disconnected.set(), timeout=20.0, **client_kwargs
+    ) as client:
         if not client.is_connected:
             print("Failed to connect")
             return
-        print("Connected. Discovering services...")
+        if cached_services:
+            print(f"Connected. Discovering {len(cached_services)} cached service(s)...")
+        else:
+            print("Connected. Discovering services...")
+        gatt = _GattIndex(client.services)
+        # Kept referenced for the whole connection (see _request_low_latency_connection)
+        connection_request = _request_low_latency_connection(client) if LOW_LATENCY_CONNECTION else None
+
+        # A matching signature means the layout is unchanged since the last connect to this device
+        gatt_services = _used_services(gatt) if gatt_cache_path else []
+        gatt_signature = _gatt_signature(gatt_services) if gatt_cache_path else ""
+        if gatt_cache is not None and gatt_cache.get("signature") != gatt_signature:
+            gatt_cache = None
+            if cached_services:
+                # Only part of the tree was discovered; don't cache it, rediscover everything next time
+                print("GATT layout differs from the cache; full discovery on next connect.")
+                _invalidate_gatt_cache(gatt_cache_path)
+                gatt_cache_path = None
+        cached_reads = dict(gatt_cache.get("reads") or {}) if gatt_cache else {}
+        new_reads: dict = {}
+        service_changed_char = gatt.chars_by_uuid.get(_SERVICE_CHANGED_CHAR_UUID_NORM)
+        if service_changed_char is not None and not (
+            gatt_cache_path and "indicate" in service_changed_char._props_set
+        ):
+            service_changed_char = None
+
+        def _service_changed_handler(characteristic: BleakGATTCharacteristic, data: bytearray) -> None:
+            _invalidate_gatt_cache(gatt_cache_path)
+            notification_handler(characteristic, data)
 
         if gatt_dump_file:
             try:
-                tree = _gatt_tree_string(client)
-                with open(gatt_dump_file, "w", encoding="utf-8") as f:
-                    f.write(tree)
-                print(f"GATT tree written to {gatt_dump_file}")
+                _write_gatt_dump(client, gatt_dump_file)
             except Exception as e:
                 print(f"GATT dump failed: {e}")
 
-        hid_service = None
-        report_char = None
-        control_point_char = None
-
-        for service in client.services:
-            if service.uuid and service.uuid.lower() == HID_SERVICE_UUID:
-                hid_service = service
-                break
+        hid_service = gatt.hid
 
         if hid_service:
             # Standard HID over GATT path
             print(f"HID service found: {hid_service.uuid}")
+            # First notifying Report char of the HID service; an input Report may follow feature/output ones
+            hid_reports = [
+                char
+                for char in hid_service.characteristics
+                if _uuid_norm(char) == _HID_CHAR_UUID_NORMS["report"]
+            ]
+            report_char = next(
+                (char for char in hid_reports if "notify" in char._props_set or "indicate" in char._props_set),
+                hid_reports[0] if hid_reports else None,
+            )
+            control_point_char = gatt.chars_by_uuid.get(_HID_CHAR_UUID_NORMS["control_point"])
+            info_char = gatt.chars_by_uuid.get(_HID_CHAR_UUID_NORMS["information"])
+            report_map_char = gatt.chars_by_uuid.get(_HID_CHAR_UUID_NORMS["report_map"])
             for char in hid_service.characteristics:
-                uuid_lower = (char.uuid or "").lower()
-                if uuid_lower == HID_CHAR_UUIDS["report"]:
-                    report_char = char
-                elif uuid_lower == HID_CHAR_UUIDS["control_point"]:
-                    control_point_char = char
                 print(f"  Char: {char.uuid} handle={char.handle} props={char.properties}")
 
-            if report_char and ("notify" in report_char.properties or "indicate" in report_char.properties):
-                await client.start_notify(report_char.uuid, notification_handler)
+            # Subscribe the Report char and any Environmental Sensing (0x181A) chars in one concurrent batch
+            env_service = gatt.env_sensing
+            to_notify = []
+            if report_char and ("notify" in report_char._props_set or "indicate" in report_char._props_set):
+                to_notify.append(report_char)
+            if env_service is not None:
+                to_notify.extend(
+                    char
+                    for char in env_service.characteristics
+                    if "notify" in char._props_set or "indicate" in char._props_set
+                )
+            notify_errors = await _start_notifications(client, [(char, notification_handler) for char in to_notify])
+            if report_char is not None and report_char.handle in notify_errors:
+                if notify_errors[report_char.handle] is not None:
+                    raise notify_errors[report_char.handle]
                 print("Report notifications enabled")
-            if control_point_char and ("write" in control_point_char.properties or "write-without-response" in control_point_char.properties):
+            if control_point_char and ("write" in control_point_char._props_set or "write-without-response" in control_point_char._props_set):
+                # Exit Suspend is acknowledged (write-with-response) whenever the Control Point allows it
                 await client.write_gatt_char(
-                    control_point_char.uuid,
+                    control_point_char,
                     HID_CONTROL_POINT_EXIT_SUSPEND,
-                    response="write" in control_point_char.properties,
+                    response="write" in control_point_char._props_set,
                 )
                 print("HID Control Point written: Exit Suspend (0x01)")
-            for char in hid_service.characteristics:
-                if "read" in char.properties and (char.uuid or "").lower() in (HID_CHAR_UUIDS["information"], HID_CHAR_UUIDS["report_map"]):
+            for char, label in ((info_char, ""), (report_map_char, " (HID Report Map)")):
+                if char is not None and "read" in char._props_set:
+                    cached_hex = cached_reads.get(char.uuid)
+                    if cached_hex is not None:
+                        print(f"  Cached {char.uuid}{label}: len={len(cached_hex) // 2} hex={cached_hex}")
+                        continue
                     try:
-                        value = await client.read_gatt_char(char.uuid)
-                        label = " (HID Report Map)" if (char.uuid or "").lower().replace("-", "") == HID_CHAR_UUIDS["report_map"].replace("-", "") else ""
+                        value = await client.read_gatt_char(char)
+                        new_reads[char.uuid] = value.hex()
                         print(f"  Read {char.uuid}{label}: len={len(value)} hex={value.hex()}")
                     except Exception as e:
                         print(f"  Read {char.uuid} failed: {e}")
-            # Optional: discover and subscribe/read Environmental Sensing (0x181A) if present
-            env_sensing_uuid = ENVIRONMENTAL_SENSING_SERVICE_UUID.lower().replace("-", "")
-            for service in client.services:
-                if (service.uuid or "").lower().replace("-", "") != env_sensing_uuid:
-                    continue
-                print(f"Environmental Sensing service (0x181A) found: {service.uuid}")
-                for char in service.characteristics:
+            # Optional: Environmental Sensing (0x181A) if present (subscribed above), read what is readable
+            if env_service is not None:
+                print(f"Environmental Sensing service (0x181A) found: {env_service.uuid}")
+                for char in env_service.characteristics:
                     props = ",".join(char.properties) if char.properties else ""
                     print(f"  Char {char.uuid} [{props}]")
-                    if char.properties and ("notify" in char.properties or "indicate" in char.properties):
-                        try:
-                            await client.start_notify(char.uuid, notification_handler)
+                    if char.handle in notify_errors:
+                        if notify_errors[char.handle] is None:
                             print(f"    -> Notifications enabled")
-                        except Exception as e:
-                            print(f"    -> Notify failed: {e}")
-                    if "read" in (char.properties or []):
+                        else:
+                            print(f"    -> Notify failed: {notify_errors[char.handle]}")
+                    if "read" in char._props_set:
                         try:
-                            value = await client.read_gatt_char(char.uuid)
+                            value = await client.read_gatt_char(char)
                             print(f"  Read {char.uuid}: len={len(value)} hex={value.hex()}")
                         except Exception as e:
                             print(f"  Read {char.uuid} failed: {e}")
         else:
             # No HID service: device uses vendor GATT (e.g. smart ring). Dump full tree and enable all notifications.
             print("HID service (0x1812) not found — device uses vendor GATT.")
-            print("Full GATT tree:")
+            if gatt_cache is None:
+                sys.stdout.write("\n".join(["Full GATT tree:", *_gatt_tree_lines(gatt.services, "  ")]) + "\n")
+            else:
+                print(f"Full GATT tree: unchanged since last connect (cached in {gatt_cache_path})")
+            # Enable notify/indicate on every characteristic that supports it
+            subscriptions = [
+                (char, _service_changed_handler if char is service_changed_char else notification_handler)
+                for char in gatt.chars
+                if "notify" in char._props_set or "indicate" in char._props_set
+            ]
+            notify_errors = await _start_notifications(client, subscriptions)
             notify_count = 0
-            for service in client.services:
-                print(f"  Service {service.uuid} (handle {service.handle})")
-                for char in service.characteristics:
-                    props = ",".join(char.properties) if char.properties else ""
-                    print(f"    Char {char.uuid} handle={char.handle} [{props}]")
-                    for desc in char.descriptors:
-                        print(f"      Descriptor {desc.uuid} handle={desc.handle}")
-                    # Enable notify/indicate on every characteristic that supports it
-                    if char.properties and ("notify" in char.properties or "indicate" in char.properties):
-                        try:
-                            await client.start_notify(char.uuid, notification_handler)
-                            notify_count += 1
-                            print(f"    -> Notifications enabled")
-                        except Exception as e:
-                            print(f"    -> Notify failed: {e}")
+            for char, _ in subscriptions:
+                error = notify_errors[char.handle]
+                if error is not None:
+                    print(f"  Notify failed ({char.uuid}): {error}")
+                    continue
+                notify_count += 1
+                if char is service_changed_char:
+                    service_changed_char = None  # subscribed here; don't subscribe again below
             print(f"Enabled notifications on {notify_count} characteristic(s).")
             # Optional: write to vendor write characteristics (e.g. enable IMU / stream)
-            for hex_payload, char_uuid_norm in (
-                (write_ae41_hex, VENDOR_CHAR_AE41_UUID.lower().replace("-", "")),
-                (write_fff2_hex, VENDOR_CHAR_FFF2_UUID.lower().replace("-", "")),
-            ):
-                if not hex_payload:
-                    continue
-                payload = bytes.fromhex(hex_payload.replace(" ", ""))
-                for service in client.services:
-                    for char in service.characteristics:
-                        if (char.uuid or "").lower().replace("-", "") != char_uuid_norm:
-                            continue
-                        if "write-without-response" not in (char.properties or []) and "write" not in (char.properties or []):
-                            continue
-                        try:
-                            await client.write_gatt_char(
-                                char.uuid,
-                                payload,
-                                response="write" in (char.properties or []),
-                            )
-                            print(f"  Wrote {char.uuid}: hex={hex_payload} ({len(payload)} bytes)")
-                        except Exception as e:
-                            print(f"  Write {char.uuid} failed: {e}")
-                        break
-            # Read readable characteristics in vendor / sensor services (incl. Environmental Sensing 0x181A)
-            vendor_uuids = ("0000ae40", "0000ae00", "0000fff0", "0000181a")
-            for service in client.services:
-                suuid = (service.uuid or "").lower().replace("-", "")
-                if not any(suuid.startswith(u.replace("-", "")) for u in vendor_uuids):
-                    continue
-                for char in service.characteristics:
-                    if "read" not in (char.properties or []):
-                        continue
+            vendor_writes = [
+                (payload, char_uuid_norm)
+                for payload, char_uuid_norm in (
+                    (write_ae41, _VENDOR_CHAR_AE41_UUID_NORM),
+                    (write_fff2, _VENDOR_CHAR_FFF2_UUID_NORM),
+                )
+                if payload
+            ]
+            for payload, char_uuid_norm in vendor_writes:
+                # The first writable match in every service that has one, not just the first in the tree
+                for char in gatt.writable_chars_by_uuid.get(char_uuid_norm, ()):
                     try:
-                        value = await client.read_gatt_char(char.uuid)
-                        print(f"  Read {char.uuid}: {value.hex()} ({list(value)})")
+                        # Prefer write-without-response: vendor enable commands don't need the ATT round-trip
+                        await client.write_gatt_char(
+                            char,
+                            payload,
+                            response="write-without-response" not in char._props_set,
+                        )
+                        print(f"  Wrote {char.uuid}: hex={payload.hex()} ({len(payload)} bytes)")
                     except Exception as e:
-                        print(f"  Read {char.uuid} failed: {e}")
+                        print(f"  Write {char.uuid} failed: {e}")
+            # Read readable characteristics in vendor / sensor services (incl. Environmental Sensing 0x181A)
+            readable = [char for service in gatt.vendor for char in service.characteristics if "read" in char._props_set]
+            for char, result in zip(readable, await _read_chars(client, readable)):
+                if isinstance(result, BaseException):
+                    print(f"  Read {char.uuid} failed: {result}")
+                else:
+                    print(f"  Read {char.uuid}: {result.hex()} ({list(result)})")
+
+        # Watch Service Changed so a firmware/layout change invalidates the cache (the vendor path subscribed above)
+        if service_changed_char is not None:
+            try:
+                await client.start_notify(service_changed_char, _service_changed_handler)
+            except Exception as e:
+                print(f"Service Changed indications not enabled: {e}")
+        if gatt_cache_path and (gatt_cache is None or new_reads):
+            cached_reads.update(new_reads)
+            _save_gatt_cache(
+                gatt_cache_path,
+                {
+                    "address": device.address,
+                    "signature": gatt_signature,
+                    "services": [service.uuid for service in gatt_services],
+                    "reads": cached_reads,
+                    # a cache hit may have discovered only part of the tree; the cached full tree is still valid
+                    "tree": gatt_cache["tree"] if gatt_cache is not None else list(_gatt_tree_lines(gatt.services)),
+                },
+            )
 
         # Battery: standard service first, then optional vendor heuristic; track changes and notify callback
-        battery_state: dict = {"last": None}
-        battery_char = _find_battery_char(client)
+        battery_state = _BatteryState()
+        battery_notify_enabled = False
+        battery_char = _find_battery_char(gatt)
         if battery_char:
             level = await _read_battery_level(client, battery_char)
             if level is not None:
-                battery_state["last"] = level
+                battery_state.last = level
                 print(f"Battery: {level}%")
                 if on_battery_updated is not None:
                     on_battery_updated(level)
             # Enable battery notifications if supported so we get updates as they happen
-            if battery_char.properties and ("notify" in battery_char.properties or "indicate" in battery_char.properties):
-                def _battery_notification_handler(characteristic: BleakGATTCharacteristic, data: bytearray) -> None:
-                    if data is not None and len(data) >= 1:
-                        level_val = min(100, max(0, int(data[0])))
-                        if level_val != battery_state.get("last"):
-                            print(f"Battery: {level_val}%")
-                            battery_state["last"] = level_val
-                        if on_battery_updated is not None:
-                            on_battery_updated(level_val)
+            if "notify" in battery_char._props_set or "indicate" in battery_char._props_set:
+                def _battery_notification_handler(
+                    characteristic: BleakGATTCharacteristic,
+                    data: bytearray,
+                    _state: _BatteryState = battery_state,
+                    _callback: Optional[Callable[[int], None]] = on_battery_updated,
+                    _print: Callable[..., None] = print,
+                ) -> None:
+                    if data:
+                        level_val = data[0]
+                        if level_val > 100:
+                            level_val = 100
+                        if level_val != _state.last:
+                            _print(f"Battery: {level_val}%")
+                            _state.last = level_val
+                        if _callback is not None:
+                            _callback(level_val)
                 try:
-                    await client.start_notify(battery_char.uuid, _battery_notification_handler)
+                    await client.start_notify(battery_char, _battery_notification_handler)
+                    battery_notify_enabled = True
                 except Exception as e:
                     print(f"Battery notifications not enabled: {e}")
         else:
             # Vendor fallback: try first readable char in vendor services; if single byte 0-100, log as possible battery
-            vendor_uuids = ("0000ae40", "0000ae00", "0000fff0", "0000181a")
-            for service in client.services:
-                suuid = (service.uuid or "").lower().replace("-", "")
-                if not any(suuid.startswith(u.replace("-", "")) for u in vendor_uuids):
-                    continue
+            for service in gatt.vendor:
                 for char in service.characteristics:
-                    if "read" not in (char.properties or []):
+                    if "read" not in char._props_set:
                         continue
                     try:
-                        value = await client.read_gatt_char(char.uuid)
+                        value = await client.read_gatt_char(char)
                         if value is not None and len(value) == 1 and 0 <= value[0] <= 100:
                             print(f"Possible battery (vendor {char.uuid}): {value[0]}%")
                             if on_battery_updated is not None:
@@ -419,54 +1031,62 @@ async def run_hid_client(
                     break
                 break
 
-        keepalive_char = _pick_keepalive_char(client, battery_char, keepalive_mode)
+        keepalive_char = _pick_keepalive_char(gatt, battery_char, keepalive_mode)
         log_battery_on_keepalive = keepalive_mode == "battery" and battery_char is not None
+        if battery_notify_enabled and battery_poll_interval > 0:
+            # The ring pushes level changes; polling the same characteristic would only repeat them
+            print("Battery notifications enabled; periodic battery poll disabled.")
+            battery_poll_interval = 0
 
         print("Running. Press Ctrl+C to disconnect.")
-        keepalive_task = None
-        battery_poll_task = None
+        is_connected = lambda: client.is_connected
+        periodic_jobs: List[Tuple[float, Callable[[], Awaitable[None]]]] = []
         if keepalive_interval > 0 and keepalive_char:
-            keepalive_task = asyncio.create_task(
-                _keepalive_loop(
-                    client,
+            periodic_jobs.append(
+                (
                     keepalive_interval,
-                    keepalive_char,
-                    lambda: client.is_connected,
-                    log_battery=log_battery_on_keepalive,
-                    battery_state=battery_state if battery_char else None,
-                    on_battery_updated=on_battery_updated,
+                    functools.partial(
+                        _keepalive_read,
+                        client,
+                        keepalive_char,
+                        is_connected,
+                        log_battery=log_battery_on_keepalive,
+                        battery_state=battery_state if keepalive_char is battery_char else None,
+                        on_battery_updated=on_battery_updated,
+                    ),
                 )
             )
         if battery_poll_interval > 0 and battery_char is not None:
-            battery_poll_task = asyncio.create_task(
-                _battery_poll_loop(
-                    client,
-                    battery_char,
+            periodic_jobs.append(
+                (
                     battery_poll_interval,
-                    lambda: client.is_connected,
-                    battery_state,
-                    on_battery_updated=on_battery_updated,
+                    functools.partial(
+                        _battery_poll,
+                        client,
+                        battery_char,
+                        is_connected,
+                        battery_state,
+                        on_battery_updated=on_battery_updated,
+                    ),
                 )
             )
+        periodic_task = asyncio.create_task(_periodic_loop(periodic_jobs, disconnected)) if periodic_jobs else None
         try:
-            while client.is_connected:
-                await asyncio.sleep(1.0)
+            if client.is_connected:
+                await disconnected.wait()
         except asyncio.CancelledError:
             pass
         finally:
-            if keepalive_task is not None:
-                keepalive_task.cancel()
-                try:
-                    await keepalive_task
-                except asyncio.CancelledError:
-                    pass
-            if battery_poll_task is not None:
-                battery_poll_task.cancel()
+            if periodic_task is not None:
+                periodic_task.cancel()
                 try:
-                    await battery_poll_task
+                    await periodic_task
                 except asyncio.CancelledError:
                     pass
+            if notification_logger is not None:
+                notification_logger.close()
         print("Disconnecting...")
+    del connection_request  # released only once the client has disconnected
 
 
 async def run_hid_client_with_reconnect(
@@ -478,8 +1098,15 @@ async def run_hid_client_with_reconnect(
     battery_poll_interval: float = 60.0,
     on_battery_updated: Optional[Callable[[int], None]] = None,
     gatt_dump_file: Optional[str] = None,
-    write_ae41_hex: Optional[str] = None,
-    write_fff2_hex: Optional[str] = None,
+    write_ae41: Optional[bytes] = None,
+    write_fff2: Optional[bytes] = None,
+    notify_verbose: bool = NOTIFY_VERBOSE,
+    report_layout_verbose: bool = REPORT_LAYOUT_VERBOSE,
+    on_notification: Optional[NotificationCallback] = None,
+    notify_log_batch_size: int = NOTIFY_LOG_BATCH_SIZE,
+    notify_log_batch_delay: float = NOTIFY_LOG_BATCH_DELAY,
+    gatt_cache_dir: Optional[str] = GATT_CACHE_DIR,
+    notify_raw_file: Optional[str] = NOTIFY_RAW_FILE,
 ) -> None:
     """
     Run the HID client indefinitely, reconnecting after disconnect.
@@ -490,8 +1117,10 @@ async def run_hid_client_with_reconnect(
     battery_poll_interval: seconds between battery reads when battery char exists (0 = disabled, default 60).
     on_battery_updated: optional callback(level: int) when battery level is read or changes.
     gatt_dump_file: if set, write full GATT tree to this file on each connect.
-    write_ae41_hex: if set, write this hex to 0xAE41 on each connect (vendor path only).
-    write_fff2_hex: if set, write this hex to 0xFFF2 on each connect (vendor path only).
+    write_ae41: if set, write this payload to 0xAE41 on each connect (vendor path only).
+    write_fff2: if set, write this payload to 0xFFF2 on each connect (vendor path only).
+    notify_verbose, report_layout_verbose, on_notification, notify_log_batch_size, notify_log_batch_delay,
+    gatt_cache_dir, notify_raw_file: passed to run_hid_client.
     """
     target = address_or_name if address_or_name else DEFAULT_DEVICE_ADDRESS
     while True:
@@ -503,12 +1132,20 @@ async def run_hid_client_with_reconnect(
                 battery_poll_interval=battery_poll_interval,
                 on_battery_updated=on_battery_updated,
                 gatt_dump_file=gatt_dump_file,
-                write_ae41_hex=write_ae41_hex,
-                write_fff2_hex=write_fff2_hex,
+                write_ae41=write_ae41,
+                write_fff2=write_fff2,
+                notify_verbose=notify_verbose,
+                report_layout_verbose=report_layout_verbose,
+                on_notification=on_notification,
+                notify_log_batch_size=notify_log_batch_size,
+                notify_log_batch_delay=notify_log_batch_delay,
+                gatt_cache_dir=gatt_cache_dir,
+                notify_raw_file=notify_raw_file,
             )
         except asyncio.CancelledError:
             raise
         except (BleakError, asyncio.TimeoutError, OSError, ConnectionError) as e:
+            _device_scanner.forget(target)  # rescan next time in case the cached device is stale
             print(f"Disconnected: {e}")
             print(f"Will retry in {reconnect_delay} seconds...")
             await asyncio.sleep(reconnect_delay)
@@ -520,6 +1157,34 @@ async def run_hid_client_with_reconnect(
             await asyncio.sleep(reconnect_delay)
 
 
+def run_async(coro) -> None:
+    """
+    Run coro to completion on a new event loop with asyncio debug mode forced off. Uses uvloop on Linux/macOS
+    when installed (faster callback dispatch for notifications and timers), else the stdlib loop.
+    """
+    use_uvloop = uvloop is not None and sys.platform in ("linux", "darwin")
+    if hasattr(asyncio, "Runner"):  # Python 3.11+
+        with asyncio.Runner(debug=False, loop_factory=uvloop.new_event_loop if use_uvloop else None) as runner:
+            runner.run(coro)
+        return
+    if use_uvloop:
+        uvloop.install()
+    asyncio.run(coro, debug=False)
+
+
+def _device_arg(value: str) -> str:
+    """argparse type: canonicalize a BLE address (AA:BB:CC:DD:EE:FF, any case) to upper case; names pass through unchanged."""
+    return value.upper() if _MAC_RE.match(value) else value
+
+
+def _hex_bytes(value: str) -> bytes:
+    """argparse type: decode a hex string (e.g. "0201") to bytes, failing at parse time if invalid."""
+    try:
+        return bytes.fromhex(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid hex payload: {value!r}") from None
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(
         description="HID over GATT client with battery, optional keepalive, and auto-reconnect."
@@ -527,6 +1192,7 @@ def main() -> None:
     parser.add_argument(
         "device",
         nargs="?",
+        type=_device_arg,
         default=None,
         help="BLE address (AA:BB:CC:DD:EE:FF) or device name. Default: %(default)s",
     )
@@ -563,21 +1229,21 @@ def main() -> None:
     )
     parser.add_argument(
         "--write-ae41",
-        type=str,
+        type=_hex_bytes,
         default=None,
         metavar="HEX",
         help="On connect (vendor path), write HEX to char 0xAE41 (e.g. 01). No spaces.",
     )
     parser.add_argument(
         "--write-fff2",
-        type=str,
+        type=_hex_bytes,
         default=None,
         metavar="HEX",
         help="On connect (vendor path), write HEX to char 0xFFF2 (e.g. 01). No spaces.",
     )
     args = parser.parse_args()
 
-    asyncio.run(
+    run_async(
         run_hid_client_with_reconnect(
             args.device,
             reconnect_delay=args.reconnect_delay,
@@ -585,8 +1251,8 @@ def main() -> None:
             keepalive_mode=args.keepalive_mode,
             battery_poll_interval=args.battery_poll_interval,
             gatt_dump_file=args.gatt_dump or None,
-            write_ae41_hex=args.write_ae41,
-            write_fff2_hex=args.write_fff2,
+            write_ae41=args.write_ae41,
+            write_fff2=args.write_fff2,
         )
     )
 
@@ -3,8 +3,9 @@
 RayNeo X2 Ring BLE client with OSCQuery exposure.
 
 Starts an OSCQuery server, then runs the BLE client from main.py. Incoming
-notification payloads are parsed (bytes at indices 10, 11, 12) and exposed
-as OSCQuery nodes so clients can discover and read them via OSCQuery only.
+report notifications (HID Report, or any characteristic of a vendor service)
+are parsed (bytes at indices 10, 11, 12) and exposed as OSCQuery nodes so
+clients can discover and read them via OSCQuery only.
 
 Usage:
   pip install -r requirements.txt
@@ -14,7 +15,8 @@ Usage:
   python run_ring_oscquery.py --help                            # show all options
 
   Options can also be set via env: RING_BLE_RECONNECT_DELAY, RING_BLE_KEEPALIVE_INTERVAL,
-  RING_BLE_KEEPALIVE_MODE, RING_BLE_BATTERY_POLL_INTERVAL (CLI overrides env).
+  RING_BLE_KEEPALIVE_MODE, RING_BLE_BATTERY_POLL_INTERVAL, RING_BLE_OSC_PUBLISH_RATE (CLI overrides env).
+  RING_BLE_OSC_IMU=0 turns off accel/gyro parsing and the /ring/accel_* and /ring/gyro_* nodes.
 """
 
 from __future__ import annotations
@@ -23,22 +25,39 @@ import argparse
 import asyncio
 import os
 import signal
+import struct
 import sys
+from typing import Optional
 
 # Payload indices for pointer/touch (adjust if protocol changes)
 IDX_BYTE_10 = 10
 IDX_BYTE_11 = 11
 IDX_BYTE_12 = 12
+# X, Y, press read in one unpack from IDX_BYTE_10 (the three indices are consecutive)
+_POINTER_STRUCT = struct.Struct("3B")
+if not IDX_BYTE_10 + 1 == IDX_BYTE_11 == IDX_BYTE_12 - 1:
+    raise ValueError("IDX_BYTE_10..IDX_BYTE_12 must be consecutive: X, Y and press are read in one unpack")
 
-# IMU: optional parsing from HID report (bytes 0-5 accel XYZ, 6-11 gyro XYZ as int16 LE). Set REPORT_MIN_LEN_FOR_IMU to 0 to disable.
+# IMU: optional parsing from HID report (bytes 0-5 accel XYZ, 6-11 gyro XYZ as int16 LE). REPORT_MIN_LEN_FOR_IMU = 0
+# disables it (no accel/gyro nodes, no IMU decoding); RING_BLE_OSC_IMU=0 does that from the environment.
 ACCEL_START = 0
 ACCEL_BYTES = 6  # 3 x int16 LE
 GYRO_START = 6
 GYRO_BYTES = 6   # 3 x int16 LE
-REPORT_MIN_LEN_FOR_IMU = 12  # need at least 12 bytes to parse accel + gyro
+REPORT_MIN_LEN_FOR_IMU = (
+    12 if os.environ.get("RING_BLE_OSC_IMU", "1").lower() in ("1", "true", "yes") else 0
+)  # need at least 12 bytes to parse accel + gyro
 # Scale: int16 LSB to physical (e.g. 16384 = 1g for accel; adjust per device)
 IMU_ACCEL_SCALE = 1.0 / 16384.0
 IMU_GYRO_SCALE = 1.0 / 16384.0
+# Accel XYZ + gyro XYZ in one unpack from ACCEL_START (gyro directly follows accel: GYRO_START = ACCEL_START + ACCEL_BYTES)
+_IMU_STRUCT = struct.Struct(f"<{(ACCEL_BYTES + GYRO_BYTES) // 2}h")
+if GYRO_START != ACCEL_START + ACCEL_BYTES:
+    raise ValueError("GYRO_START must equal ACCEL_START + ACCEL_BYTES: accel and gyro are read in one unpack")
+
+# Node updates from notifications are coalesced and pushed to OSCQuery at most this many times per second
+# (latest value per node wins); 0 = push on every notification
+PUBLISH_RATE = 60.0
 
 HTTP_PORT = 9020
 OSC_PORT = 9020
@@ -82,54 +101,183 @@ def _create_oscquery_service_and_nodes():
     return service
 
 
-def _parse_int16_le(data: bytearray, offset: int) -> int:
-    """Parse int16 little-endian from data at offset; return 0 if out of range."""
-    if offset + 2 > len(data):
-        return 0
-    low, high = data[offset], data[offset + 1]
-    v = low | (high << 8)
-    return v - 65536 if v >= 32768 else v
+def _make_value_publisher(service):
+    """
+    Return publish(updates) that sends (path, value) pairs to service.update_value(), skipping any value equal to
+    the last one published for that path. Each update_value() is a node lookup plus a push to every WebSocket
+    listener, so repeated values (pointer idle, press held) are not resent.
+    """
+    update_value = service.update_value
+    last_values = {}
+
+    def publish(updates):
+        for path, value in updates:
+            if path in last_values and last_values[path] == value:
+                continue
+            update_value(path, value)
+            last_values[path] = value
 
+    return publish
 
-def _make_notification_wrapper(original_handler, service, debug=False):
-    """Return a wrapper that calls the original handler and updates OSCQuery nodes via service.update_value()."""
 
-    def wrapper(characteristic, data: bytearray):
-        original_handler(characteristic, data)
+def _is_report_char(characteristic) -> bool:
+    """
+    Whether notifications from characteristic carry ring reports: the HID Report characteristic (HID path) or any
+    characteristic of a vendor service (vendor GATT path); battery, Service Changed, Environmental Sensing etc. are
+    ignored. Uses main.py's UUID constants; computed once and cached on the object.
+    """
+    try:
+        return characteristic._ring_report
+    except AttributeError:
+        import main as main_module
+
+        service_uuid = (getattr(characteristic, "service_uuid", None) or "").lower()
+        is_report = main_module._uuid_norm(characteristic) == main_module._HID_CHAR_UUID_NORMS["report"]
+        if not is_report:
+            is_report = service_uuid.startswith(main_module._VENDOR_REPORT_SERVICE_UUID_PREFIXES)
+        characteristic._ring_report = is_report
+        return is_report
+
+
+def _make_report_parser(debug=False):
+    """Return parse(data) -> [(node path, value), ...] for one report payload (IMU and pointer nodes)."""
+
+    # Module constants and bound methods are default args so the per-report path only does local loads
+    def parse(
+        data,
+        _imu_min_len=REPORT_MIN_LEN_FOR_IMU,
+        _accel_start=ACCEL_START,
+        _accel_scale=IMU_ACCEL_SCALE,
+        _gyro_scale=IMU_GYRO_SCALE,
+        _unpack_imu=_IMU_STRUCT.unpack_from,
+        _i10=IDX_BYTE_10,
+        _i12=IDX_BYTE_12,
+        _unpack_pointer=_POINTER_STRUCT.unpack_from,
+        _debug=debug,
+    ):
+        n = len(data)
+        updates = []
         # IMU: parse accel/gyro from first 12 bytes when report is long enough
-        if REPORT_MIN_LEN_FOR_IMU > 0 and len(data) >= REPORT_MIN_LEN_FOR_IMU:
+        if _imu_min_len > 0 and n >= _imu_min_len:
             try:
-                ax = _parse_int16_le(data, ACCEL_START + 0) * IMU_ACCEL_SCALE
-                ay = _parse_int16_le(data, ACCEL_START + 2) * IMU_ACCEL_SCALE
-                az = _parse_int16_le(data, ACCEL_START + 4) * IMU_ACCEL_SCALE
-                gx = _parse_int16_le(data, GYRO_START + 0) * IMU_GYRO_SCALE
-                gy = _parse_int16_le(data, GYRO_START + 2) * IMU_GYRO_SCALE
-                gz = _parse_int16_le(data, GYRO_START + 4) * IMU_GYRO_SCALE
-                service.update_value("/ring/accel_x", ax)
-                service.update_value("/ring/accel_y", ay)
-                service.update_value("/ring/accel_z", az)
-                service.update_value("/ring/gyro_x", gx)
-                service.update_value("/ring/gyro_y", gy)
-                service.update_value("/ring/gyro_z", gz)
+                ax, ay, az, gx, gy, gz = _unpack_imu(data, _accel_start)
+                updates += (
+                    ("/ring/accel_x", ax * _accel_scale),
+                    ("/ring/accel_y", ay * _accel_scale),
+                    ("/ring/accel_z", az * _accel_scale),
+                    ("/ring/gyro_x", gx * _gyro_scale),
+                    ("/ring/gyro_y", gy * _gyro_scale),
+                    ("/ring/gyro_z", gz * _gyro_scale),
+                )
             except Exception as e:
-                if debug:
+                if _debug:
                     print(f"[OSCQuery] IMU parse failed: {e}")
         # Pointer/touch: bytes 10, 11, 12
-        if len(data) <= IDX_BYTE_12:
-            if debug:
-                print(f"[OSCQuery] Skipped pointer update: len(data)={len(data)} (need > {IDX_BYTE_12})")
+        if n <= _i12:
+            if _debug:
+                print(f"[OSCQuery] Skipped pointer update: len(data)={n} (need > {_i12})")
+        else:
+            x_val, y_val, press_val = _unpack_pointer(data, _i10)
+            updates += (("/ring/X", x_val), ("/ring/Y", y_val), ("/ring/press", press_val))
+            if _debug:
+                print(f"[OSCQuery] Report: X={x_val} Y={y_val} press={press_val}")
+        return updates
+
+    return parse
+
+
+class _CoalescingPublisher:
+    """
+    Fixed-rate front end for parse + publish: stash() only keeps the latest raw report per characteristic, and the
+    run() task parses and publishes what was stashed since its last pass, at most rate_hz times per second. Reports
+    superseded before the next pass are never parsed, so when notifications outrun the publish rate the IMU/pointer
+    decoding and OSCQuery updates follow the publish rate instead of the notification rate. Reports whose press byte
+    changed are kept in order and published ahead of the interval, so no press or release is coalesced away.
+    """
+
+    def __init__(self, publish, parse, rate_hz: float, press_index: int = IDX_BYTE_12) -> None:
+        self._publish = publish
+        self._parse = parse
+        self._interval = 1.0 / rate_hz
+        self._press_index = press_index
+        self._pending = {}
+        self._edges = []
+        self._last_press = {}
+        # Events are created in run(), on the loop that runs it (Python < 3.10 binds them at creation)
+        self._wake: Optional[asyncio.Event] = None
+        self._edge: Optional[asyncio.Event] = None
+
+    def stash(self, handle: int, data: bytearray) -> None:
+        """Keep a copy of the latest report from characteristic handle; called from the notification callback."""
+        if len(data) > self._press_index:
+            press = data[self._press_index]
+            if press != self._last_press.setdefault(handle, press):
+                self._last_press[handle] = press
+                self._pending.pop(handle, None)
+                self._edges.append(bytes(data))
+                if self._wake is not None:
+                    self._edge.set()
+                    self._wake.set()
+                return
+        self._pending[handle] = bytes(data)
+        if self._wake is not None:
+            self._wake.set()
+
+    async def run(self) -> None:
+        """Publish stashed reports until cancelled: right after the first stash, then at most once per interval."""
+        self._edge = edge = asyncio.Event()
+        self._wake = wake = asyncio.Event()
+        if self._pending or self._edges:
+            wake.set()
+        while True:
+            await wake.wait()
+            wake.clear()
+            edge.clear()
+            edges, self._edges = self._edges, []
+            pending, self._pending = self._pending, {}
+            updates = []
+            for data in edges:
+                updates += self._parse(data)
+            for data in pending.values():
+                updates += self._parse(data)
+            try:
+                self._publish(updates)
+            except Exception as e:
+                print(f"[OSCQuery] Update failed: {e}")
+            try:
+                # the interval pause ends early for a press change
+                await asyncio.wait_for(edge.wait(), self._interval)
+            except asyncio.TimeoutError:
+                pass
+
+
+def _make_notification_wrapper(service, debug=False, publisher=None):
+    """
+    Return an on_notification callback for main.run_hid_client that updates OSCQuery nodes via service.update_value().
+    With publisher (a _CoalescingPublisher), report payloads are only stashed; it parses and publishes them.
+    """
+    if publisher is not None:
+
+        def coalescing_wrapper(characteristic, data: bytearray, _is_report=_is_report_char, _stash=publisher.stash):
+            if _is_report(characteristic):
+                _stash(characteristic.handle, data)
+
+        return coalescing_wrapper
+
+    def wrapper(
+        characteristic,
+        data: bytearray,
+        _is_report=_is_report_char,
+        _parse=_make_report_parser(debug),
+        _publish=_make_value_publisher(service),
+    ):
+        if not _is_report(characteristic):
+            return
+        updates = _parse(data)
+        if not updates:
             return
-        x_val = data[IDX_BYTE_10]
-        y_val = data[IDX_BYTE_11]
-        press_val = data[IDX_BYTE_12]
         try:
-            service.update_value("/ring/X", x_val)
-            service.update_value("/ring/Y", y_val)
-            service.update_value("/ring/press", press_val)
-            if debug:
-                print(
-                    f"[OSCQuery] Updated: X={x_val} Y={y_val} press={press_val}"
-                )
+            _publish(updates)
         except Exception as e:
             print(f"[OSCQuery] Update failed: {e}")
 
@@ -169,16 +317,12 @@ def main():
     if REPORT_MIN_LEN_FOR_IMU > 0:
         ring_nodes += ", /ring/accel_x, /ring/accel_y, /ring/accel_z, /ring/gyro_x, /ring/gyro_y, /ring/gyro_z"
     print(f"Ring nodes: {ring_nodes}")
-    original_handler = main_module.notification_handler
-    main_module.notification_handler = _make_notification_wrapper(original_handler, _service)
 
     def _on_battery_updated(level: int) -> None:
         try:
             _service.update_value("/ring/battery", level)
         except Exception as e:
             print(f"[OSCQuery] Battery update failed: {e}")
-    print("Notification handler wrapped: BLE updates will be pushed to OSCQuery nodes.")
-    print("Press Ctrl+C to disconnect and exit.")
 
     parser = argparse.ArgumentParser(
         description="RayNeo X2 Ring BLE client with OSCQuery. Options match main.py (env as defaults)."
@@ -186,6 +330,7 @@ def main():
     parser.add_argument(
         "device",
         nargs="?",
+        type=main_module._device_arg,
         default=None,
         help="BLE address (AA:BB:CC:DD:EE:FF) or device name. Default: use default from main.py",
     )
@@ -222,31 +367,49 @@ def main():
     )
     parser.add_argument(
         "--write-ae41",
-        type=str,
+        type=main_module._hex_bytes,
         default=None,
         metavar="HEX",
         help="On connect (vendor path), write HEX to char 0xAE41 (e.g. 01). No spaces.",
     )
     parser.add_argument(
         "--write-fff2",
-        type=str,
+        type=main_module._hex_bytes,
         default=None,
         metavar="HEX",
         help="On connect (vendor path), write HEX to char 0xFFF2 (e.g. 01). No spaces.",
     )
+    parser.add_argument(
+        "--publish-rate",
+        type=float,
+        default=float(os.environ.get("RING_BLE_OSC_PUBLISH_RATE", str(PUBLISH_RATE))),
+        metavar="HZ",
+        help="Max OSCQuery node updates per second, latest value wins; 0 = update on every notification "
+        f"(default: {PUBLISH_RATE:g}, env: RING_BLE_OSC_PUBLISH_RATE)",
+    )
     args = parser.parse_args()
 
+    publisher = None
+    if args.publish_rate > 0:
+        publisher = _CoalescingPublisher(_make_value_publisher(_service), _make_report_parser(), args.publish_rate)
+        on_notification = _make_notification_wrapper(_service, publisher=publisher)
+    else:
+        on_notification = _make_notification_wrapper(_service)
+    print("Notification callback registered: BLE updates will be pushed to OSCQuery nodes.")
+    print("Press Ctrl+C to disconnect and exit.")
+
     addr_or_name = args.device
     reconnect_delay = args.reconnect_delay
     keepalive_interval = args.keepalive_interval
     keepalive_mode = args.keepalive_mode
     battery_poll_interval = args.battery_poll_interval
     gatt_dump_file = args.gatt_dump or None
-    write_ae41_hex = args.write_ae41
-    write_fff2_hex = args.write_fff2
+    write_ae41 = args.write_ae41
+    write_fff2 = args.write_fff2
 
     loop = asyncio.new_event_loop()
     asyncio.set_event_loop(loop)
+    publisher_task = loop.create_task(publisher.run()) if publisher is not None else None
     task = loop.create_task(
         main_module.run_hid_client_with_reconnect(
             addr_or_name,
@@ -256,8 +419,9 @@ def main():
             battery_poll_interval=battery_poll_interval,
             on_battery_updated=_on_battery_updated,
             gatt_dump_file=gatt_dump_file,
-            write_ae41_hex=write_ae41_hex,
-            write_fff2_hex=write_fff2_hex,
+            write_ae41=write_ae41,
+            write_fff2=write_fff2,
+            on_notification=on_notification,
         )
     )
 
@@ -282,6 +446,14 @@ def main():
     except asyncio.CancelledError:
         pass
     finally:
+        if publisher_task is not None:
+            publisher_task.cancel()
+            try:
+                loop.run_until_complete(publisher_task)
+            except asyncio.CancelledError:
+                pass
+            except Exception as e:
+                print(f"[OSCQuery] Publisher task failed: {e}")
         _shutdown_oscquery_service(_service)
         loop.close()
         print("Shutdown complete.")